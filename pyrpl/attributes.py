@@ -130,7 +130,7 @@ class BaseProperty(BaseAttribute):
             value = self.get_value(module)
         self.launch_signal(module, value, appendix=appendix)
         if module._autosave_active:  # (for module, when module is slaved, don't save attributes)
-            if self.name in module._setup_attributes:
+            if self.name in module._setup_attributes_set:
                 self.save_attribute(module, value)
         if self.call_setup and not module._setup_ongoing:
             # call setup unless a bunch of attributes are being changed together.
@@ -179,9 +179,12 @@ class BaseProperty(BaseAttribute):
         return widget
 
     def get_value(self, obj):
-        if not hasattr(obj, '_' + self.name):
+        # a single lookup in the common case where the value already exists
+        try:
+            return getattr(obj, '_' + self.name)
+        except AttributeError:
             setattr(obj, '_' + self.name, self.default)
-        return getattr(obj, '_' + self.name)
+            return self.default
 
     def set_value(self, obj, val):
         setattr(obj, '_' + self.name, val)
@@ -729,11 +732,13 @@ class FilterProperty(BaseProperty):
             return value
 
     def get_value(self, obj):
-        if not hasattr(obj, '_' + self.name):
+        try:
+            return getattr(obj, '_' + self.name)
+        except AttributeError:
             # choose any value in the options as default.
             default = self.valid_frequencies(obj)[0]
             setattr(obj, '_' + self.name, default)
-        return getattr(obj, '_' + self.name)
+            return default
 
     def set_value(self, obj, value):
         return BaseProperty.set_value(self, obj, value)
@@ -763,9 +768,12 @@ class FilterRegister(BaseRegister, FilterProperty):
         # save the value of constants saved in the fpga upon first execution
         # in order to only read the corresponding register once
         var_name = "_" + self.name + "_" + attr_name
-        if not hasattr(obj, var_name):
-            setattr(obj, var_name, obj._read(getattr(self, attr_name)))
-        return getattr(obj, var_name)
+        try:
+            return getattr(obj, var_name)
+        except AttributeError:
+            value = obj._read(getattr(self, attr_name))
+            setattr(obj, var_name, value)
+            return value
 
     def _FILTERSTAGES(self, obj):
         return self.read_and_save(obj, "filterstages")
@@ -1020,11 +1028,13 @@ class BasePropertyListProperty(BaseProperty):
         return self.element_cls.validate_and_normalize(obj, val)
 
     def get_value(self, obj):
-        if not hasattr(obj, '_' + self.name):
+        try:
+            return getattr(obj, '_' + self.name)
+        except AttributeError:
             # make a new AttributeList, pass to it the instance of obj
             value = AttributeList(self, obj, self.default)
             setattr(obj, '_' + self.name, value)
-        return getattr(obj, '_' + self.name)
+            return value
 
     def set_value(self, obj, val):
         current = self.get_value(obj)
@@ -1157,9 +1167,10 @@ class SelectProperty(BaseProperty):
         # at startup, we cannot access the instance, so we must continue without it
         if instance is not None:
             # make sure default is stored in the instance, such that it can be easily modified
-            if not hasattr(instance, '_' + self.name + '_' + 'default'):
+            try:
+                default = getattr(instance, '_' + self.name + '_' + 'default')
+            except AttributeError:
                 setattr(instance, '_' + self.name + '_' + 'default', default)
-            default = getattr(instance, '_' + self.name + '_' + 'default')
         # make sure default is a valid option
         options = self.options(instance)
         if not default in options:
@@ -1179,9 +1190,10 @@ class SelectProperty(BaseProperty):
         # at startup, we cannot access the instance, so we must continue without it
         if instance is not None:
             # make sure default is stored in the instance, such that it can be easily modified
-            if not hasattr(instance, '_' + self.name + '_' + 'options'):
+            try:
+                options = getattr(instance, '_' + self.name + '_' + 'options')
+            except AttributeError:
                 setattr(instance, '_' + self.name + '_' + 'options', options)
-            options = getattr(instance, '_' + self.name + '_' + 'options')
         if callable(options):
             try:
                 options = options(instance)
@@ -1245,9 +1257,11 @@ class SelectProperty(BaseProperty):
         return value
 
     def get_value(self, obj):
-        if not hasattr(obj, '_' + self.name):
-            setattr(obj, '_' + self.name, self.get_default(obj))
-        value = getattr(obj, '_' + self.name)
+        try:
+            value = getattr(obj, '_' + self.name)
+        except AttributeError:
+            value = self.get_default(obj)
+            setattr(obj, '_' + self.name, value)
         # make sure the value is a valid option
         value = self.validate_and_normalize(obj, value)
         return value
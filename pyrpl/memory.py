@@ -262,8 +262,11 @@ class MemoryBranch(object):
     def __getattribute__(self, name):
         """ implements the dot notation.
         Example: self.subbranch.leaf returns the item 'leaf' of 'subbranch' """
-        if name.startswith('_'):
-            return super(MemoryBranch, self).__getattribute__(name)
+        # this function is called for every attribute access, including the
+        # internal ones such as self._data. Therefore, avoid the overhead of
+        # str.startswith and of creating a super() object here.
+        if name[0] == '_':
+            return object.__getattribute__(self, name)
         else:
             # convert dot notation into dict notation
             return self[name]
@@ -288,8 +291,8 @@ class MemoryBranch(object):
                 return attribute
 
     def __setattr__(self, name, value):
-        if name.startswith('_'):
-            super(MemoryBranch, self).__setattr__(name, value)
+        if name[0] == '_':
+            object.__setattr__(self, name, value)
         else:  # implemment dot notation
             self[name] = value
 
@@ -319,6 +322,18 @@ class MemoryBranch(object):
                     subbranch[k] = v
         #otherwise just write to the data dictionary
         else:
+            # skip saving if the same value is already stored, e.g. when all
+            # setup attributes of a module are reloaded from the config file
+            self._reload()
+            try:
+                old = self._data[item]
+            except (KeyError, IndexError, TypeError):
+                pass
+            else:
+                # comparison with 'is True' discards array-like results
+                if type(old) is type(value) and (old == value) is True:
+                    self.__dict__[item] = None
+                    return
             self._set_data(item, value)
         if self._root._WARNING_ON_SAVE or self._root._ERROR_ON_SAVE:
             logger.warning("Issuing call to MemoryTree._save after %s.%s=%s",
@@ -43,11 +43,13 @@ class ModuleProperty(ModuleAttribute):
         return val
 
     def get_value(self, obj):
-        if not hasattr(obj, '_' + self.name):
+        try:
+            return getattr(obj, '_' + self.name)
+        except AttributeError:
             # getter must manage the instantiation of default value
-            setattr(obj, '_' + self.name,
-                self._create_module(obj))
-        return getattr(obj, '_' + self.name)
+            module = self._create_module(obj)
+            setattr(obj, '_' + self.name, module)
+            return module
 
     def _create_module(self, obj):
         return self.module_cls(obj, name=self.name, **self.kwargs)
@@ -226,7 +228,7 @@ class ModuleDict(Module):
     @setup_attributes.setter
     def setup_attributes(self, kwds):
         Module.setup_attributes.fset(self,
-            {k: v for k, v in kwds.items() if k in self._setup_attributes})
+            {k: v for k, v in kwds.items() if k in self._setup_attributes_set})
 
     def __setitem__(self, key, value):
         # make the new ModuleProperty of module type "value" in the class
@@ -234,24 +236,33 @@ class ModuleDict(Module):
         mp.name = key  # assign module name
         setattr(self.__class__, key, mp)
         # do what the constructor would do: append to setup_attributes...
-        self._module_attributes.append(key)
-        self._setup_attributes.append(key)
+        if key not in self._module_attributes:
+            self._module_attributes.append(key)
+        if key not in self._setup_attributes_set:
+            self.__class__.make_setup_attributes(
+                self._setup_attributes + [key])
+        else:  # the descriptor of key has changed
+            self.__class__.make_setup_attr_getters()
+        self.__class__.make_help()
         # ... attribute the name
         self[key].name = key
         # initialize with saved values if available
         self[key]._load_setup_attributes()
 
     def __delitem__(self, key):
-        self._module_attributes.pop(key)
-        self._setup_attributes.pop(key)
+        self._module_attributes.remove(key)
+        self.__class__.make_setup_attributes(
+            [name for name in self._setup_attributes if name != key])
         getattr(self, key)._clear()
-        delattr(self, key)
+        # undo __setitem__: remove the ModuleProperty from the class and the
+        # submodule stored by it in the instance
+        delattr(self.__class__, key)
+        delattr(self, '_' + key)
+        self.__class__.make_help()
 
     def pop(self, key):
-        """ same as __delattr__ (does not return a value) """
-        module = self._setup_attributes.pop(key)
-        delattr(self, key)
-        return module
+        """ same as __delitem__ (does not return a value) """
+        self.__delitem__(key)
 
 
 class ModuleDictProperty(ModuleProperty):
@@ -19,13 +19,14 @@ from .attributes import BaseAttribute, ModuleAttribute
 from .widgets.module_widgets import ModuleWidget
 from .curvedb import CurveDB
 from .pyrpl_utils import unique_list, DuplicateFilter
+from .memory import isbranch
 
 from .errors import ExpectedPyrplError
 
 import logging
-import numpy as np
 from six import with_metaclass
-from collections import OrderedDict
+from six.moves import intern
+from contextlib import contextmanager
 from qtpy import QtCore
 
 
@@ -56,26 +57,37 @@ class SignalLauncher(QtCore.QObject):
         signal = getattr(self, name)
         signal.emit(*args, **kwds)
 
+    @classmethod
+    def _get_signal_names(cls):
+        """
+        Returns a tuple with the names of all signals of the class.
+
+        The list is built once per class and cached in cls._signal_names.
+        """
+        # look into cls.__dict__ only, such that subclasses defining
+        # additional signals do not use the cache of their base class
+        if '_signal_names' not in cls.__dict__:
+            cls._signal_names = tuple(
+                key for key in dir(cls)
+                if isinstance(getattr(cls, key, None), QtCore.Signal))
+        return cls._signal_names
+
     def connect_widget(self, widget):
         """
         Establishes all connections between the module and the widget by name.
         """
         #self.update_attribute_by_name.connect(widget.update_attribute_by_name)
-        for key in dir(self.__class__):
-            val = getattr(self, key)
-            if isinstance(val, QtCore.pyqtBoundSignal) and hasattr(widget,
-                                                                   key):
-                val.connect(getattr(widget, key))
+        for key in self._get_signal_names():
+            if hasattr(widget, key):
+                getattr(self, key).connect(getattr(widget, key))
 
     def _clear(self):
         """ Destroys the object by disconnecting all signals and by killing all timers"""
-        for key in dir(self.__class__):
-            val = getattr(self, key)
-            if isinstance(val, QtCore.pyqtBoundSignal):
-                try:
-                    val.disconnect()
-                except TypeError:  # occurs if signal is not connected to anything
-                    pass
+        for key in self._get_signal_names():
+            try:
+                getattr(self, key).disconnect()
+            except TypeError:  # occurs if signal is not connected to anything
+                pass
 
 
 class ModuleMetaClass(type):
@@ -138,28 +150,47 @@ class ModuleMetaClass(type):
             if True:  #len(attr.module_cls._setup_attributes) > 0:
                 _setup_attributes.append(name)
         #1d. Set the unique list of _setup_attributes
-        self._setup_attributes = unique_list(_setup_attributes)
-        self._gui_attributes = unique_list(_gui_attributes)
+        self.make_setup_attributes(unique_list(_setup_attributes))
+        self._gui_attributes = [intern(name) for name in
+                                unique_list(_gui_attributes)]
         # 2. create setup(**kwds)
+        # only modules defining _batch_writes (HardwareModules) buffer the
+        # register writes performed by setup()
+        self._has_batch_writes = any('_batch_writes' in base.__dict__
+                                     for base in self.__mro__)
         if "setup" not in classDict:
             # a. generate a setup function
             def setup(self, **kwds):
+                self._setup_depth += 1
                 self._setup_ongoing = True
                 try:
-                    # user can redefine any setup_attribute through kwds
-                    for key in self._setup_attributes:
-                        if key in kwds:
-                            value = kwds.pop(key)
-                            setattr(self, key, value)
+                    # user can redefine any setup_attribute through kwds.
+                    # Most calls pass no or a single kwd (e.g. callbacks
+                    # from the gui), so avoid scanning all _setup_attributes
+                    # unless the order of several attributes matters.
+                    if len(kwds) > 1:
+                        keys = [key for key in self._setup_attributes
+                                if key in kwds]
+                    else:
+                        keys = [key for key in kwds
+                                if key in self._setup_attributes_set]
+                    if self._has_batch_writes:
+                        with self._batch_writes():
+                            for key in keys:
+                                setattr(self, key, kwds.pop(key))
+                    else:
+                        for key in keys:
+                            setattr(self, key, kwds.pop(key))
                     if len(kwds) > 0:
                         self._logger.warning(
                             "Trying to load attribute %s of module %s that "
                             "are invalid setup_attributes.",
                             sorted(kwds.keys())[0], self.name)
-                    if hasattr(self, '_setup'):
-                        self._setup()
+                    self._setup()
                 finally:
-                    self._setup_ongoing = False
+                    self._setup_depth -= 1
+                    if not self._setup_depth:
+                        self._setup_ongoing = False
             # b. place the new setup function in the module class
             self.setup = setup
         # 3. if setup has no docstring, then make one
@@ -167,6 +198,57 @@ class ModuleMetaClass(type):
         # 4. make the new class
         #return super(ModuleMetaClass, cls).__new__(cls, classname, bases, classDict)
         self.add_attribute_docstrings()
+        # 5. collect the docstrings returned by help()
+        self.make_help()
+
+    def make_setup_attributes(self, setup_attributes):
+        """
+        Stores the names in setup_attributes as a list of interned strings
+        in self._setup_attributes, a frozenset of the same names in
+        self._setup_attributes_set for fast membership tests, and the
+        corresponding self._setup_attr_getters.
+
+        _setup_attributes of an existing class must only be changed through
+        this function in order to keep these three consistent.
+        """
+        self._setup_attributes = [intern(name) for name in
+                                  setup_attributes]
+        self._setup_attributes_set = frozenset(self._setup_attributes)
+        self.make_setup_attr_getters()
+
+    def make_setup_attr_getters(self):
+        """
+        Stores in self._setup_attr_getters a tuple of
+        (name, getter, is_module) for each setup_attribute, where getter is
+        the bound __get__ of the descriptor found in the class hierarchy.
+
+        This way, the descriptor lookup is performed once at class creation
+        rather than at each read of Module.setup_attributes.
+        """
+        getters = []
+        for name in self._setup_attributes:
+            try:
+                attr = self._getattr_static(name)
+            except AttributeError:
+                attr = None
+            getter = getattr(attr, '__get__', None)
+            if getter is None:
+                # no descriptor (e.g. instance attribute), use normal lookup
+                getter = lambda obj, owner, name=name: getattr(obj, name)
+            getters.append((name, getter, name in self._module_attributes))
+        self._setup_attr_getters = tuple(getters)
+
+    def _getattr_static(self, name):
+        """
+        Returns the class attribute name as it is stored in the __dict__ of
+        the first class of the MRO defining it, i.e. the descriptor itself
+        rather than the result of its __get__.
+        """
+        for klass in self.__mro__:
+            if name in klass.__dict__:
+                return klass.__dict__[name]
+        raise AttributeError("type object %r has no attribute %r"
+                             % (self.__name__, name))
 
     #@classmethod
     def make_setup_docstring(self, classDict):
@@ -180,10 +262,13 @@ class ModuleMetaClass(type):
         except:
             try: doc = self._setup.__func__.__doc__ + '\n'
             except: doc = ""
-        doc += "attributes\n=========="
+        lines = [doc + "attributes\n=========="]
         for attr_name in self._setup_attributes:
-            attr = getattr(self, attr_name)
-            doc += "\n  " + attr_name + ": " + attr.__doc__
+            # read the docstring from the descriptor itself, without going
+            # through the descriptor protocol
+            attr = self._getattr_static(attr_name)
+            lines.append("  " + attr_name + ": " + attr.__doc__)
+        doc = "\n".join(lines)
         setup = self.setup
         # docstring syntax differs between python versions. Python 2:
         if hasattr(setup, "__func__"):
@@ -206,32 +291,60 @@ class ModuleMetaClass(type):
                 self.__doc__+=self.__dict__[name].__doc__ + '\n'
 
 
+    def make_help(self):
+        """
+        Stores the docstrings of all attributes in the dict self._help_cache
+        and the concatenated docstrings of all public attributes in
+        self._help_full, such that Module.help() is a simple lookup.
+        """
+        help_cache = dict()
+        help_full = []
+        names = unique_list([name for klass in reversed(self.__mro__)
+                             for name in klass.__dict__])
+        for name in names:
+            attr = self._getattr_static(name)
+            if isinstance(attr, BaseAttribute):
+                docstring = attr.__doc__ or ""
+                help_cache[name] = docstring
+                # mute internal registers
+                if not name.startswith('_'):
+                    help_full.append(name + ": " + docstring + '\r\n\r\n')
+        self._help_cache = help_cache
+        self._help_full = "".join(help_full)
+
+
 class DoSetup(object):
     """
     A context manager that allows to nicely write Module setup functions.
 
-    Usage example in :py:meth:`Module._setup()`::
+    Usage example in a module method that changes several attributes::
 
-        def _setup(self):
-            # _setup_ongoing is False by default
-            assert self._setup_ongoing == False
+        def set_zeros_and_poles(self, zeros, poles):
             with self.do_setup:
-                # now _setup_ongoing is True
-                assert self._setup_ongoing == True
-                # do stuff that might fail
-                raise BaseException()
-            # even if _setup fails, _setup_ongoing is False afterwards or in
-            # the next call to _setup()
-            assert self._setup_ongoing == False
+                # _setup_ongoing is True: changing the attributes below
+                # does not call setup() after each of them
+                self.zeros = zeros
+                self.poles = poles
+            # even if the block fails, _setup_ongoing is restored afterwards
+
+    Blocks may be nested, e.g. when such a method is called from _setup(),
+    i.e. inside setup(). Each level increments the module's _setup_depth,
+    and _setup_ongoing is only reset to False when the outermost setup()
+    call or do_setup block is left. Within _setup(), _setup_ongoing is
+    therefore already True before entering the block and remains True
+    after leaving it.
     """
     def __init__(self, parent):
         self.parent = parent
 
     def __enter__(self):
+        self.parent._setup_depth += 1
         self.parent._setup_ongoing = True
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.parent._setup_ongoing = False
+        self.parent._setup_depth -= 1
+        if not self.parent._setup_depth:
+            self.parent._setup_ongoing = False
         if exc_type is not None:
             self.parent._logger.warning("Exception %s was raised while "
                                         "_setup_ongoing was True: %s, %s",
@@ -342,9 +455,18 @@ class Module(with_metaclass(ModuleMetaClass, object)):
     # This flag is used to desactivate callback during setup
     _setup_ongoing = False
 
+    # number of nested setup() calls and do_setup blocks that are running
+    _setup_depth = 0
+
     # internal memory for owner of the module (to avoid conflicts)
     _owner = None
 
+    # MemoryBranch last returned by the property c
+    _c_cache = None
+
+    # Pyrpl instance returned by the property pyrpl
+    _pyrpl_cache = None
+
     # name of the module, metaclass automatically assigns one per instance
     name = None
 
@@ -424,7 +546,12 @@ class Module(with_metaclass(ModuleMetaClass, object)):
         """
         Recursively looks through patent modules untill pyrpl instance is
         reached.
+
+        The result is stored in self._pyrpl_cache, as the module hierarchy
+        does not change.
         """
+        if self._pyrpl_cache is not None:
+            return self._pyrpl_cache
         from .pyrpl import Pyrpl
         parent = self.parent
         passedparents = set()
@@ -438,6 +565,7 @@ class Module(with_metaclass(ModuleMetaClass, object)):
                 raise ExpectedPyrplError("Unable to find a pyrpl instance "
                                          "that is parent of the module %s.",
                                          self.name)
+        self._pyrpl_cache = parent
         return parent
 
     def get_setup_attributes(self):
@@ -459,12 +587,13 @@ class Module(with_metaclass(ModuleMetaClass, object)):
         :return: a dict with the current values of the setup attributes.
         Recursively collects setup_attributes for sub_modules.
         """
-        kwds = OrderedDict()
-        for attr in self._setup_attributes:
-            val = getattr(self, attr)
-            if attr in self._modules:
+        cls = type(self)
+        kwds = {}
+        for name, getter, is_module in cls._setup_attr_getters:
+            val = getter(self, cls)
+            if is_module:
                 val = val.setup_attributes
-            kwds[attr] = val
+            kwds[name] = val
         return kwds
 
     def set_setup_attributes(self, **kwds):
@@ -490,7 +619,8 @@ class Module(with_metaclass(ModuleMetaClass, object)):
         # config file at the call of this function at startup.
         if (self.name in self.parent.c) and (self.c is not None):
             # pick those elements of the config state that are setup_attributes
-            dic = {k: v for k, v in self.c._data.items() if k in self._setup_attributes}
+            dic = {k: v for k, v in self.c._data.items()
+                   if k in self._setup_attributes_set}
             # set those elements
             self.setup_attributes = dic
 
@@ -501,7 +631,22 @@ class Module(with_metaclass(ModuleMetaClass, object)):
 
         The branch corresponding to the module is a subbranch of the parent module's branch with the name of the module.
         """
-        return self.parent.c._get_or_create(self.name)
+        parent_c = self.parent.c
+        # a MemoryBranch only stores its parent and its name and reads its
+        # data from there on demand, so the branch can be reused as long as
+        # it still exists at the same place in the config tree
+        branch = self._c_cache
+        if branch is not None and branch._parent is parent_c \
+                and branch._branch == self.name:
+            parent_c._reload()
+            try:
+                if isbranch(parent_c._data[self.name]):
+                    return branch
+            except (KeyError, IndexError, TypeError):
+                pass
+        branch = parent_c._get_or_create(self.name)
+        self._c_cache = branch
+        return branch
 
     @property
     def _states(self):
@@ -604,25 +749,19 @@ class Module(with_metaclass(ModuleMetaClass, object)):
         """
         pass
 
-    # def help(self, register=''):
-    #     """returns the docstring of the specified register name
-    #        if register is an empty string, all available docstrings are
-    #        returned"""
-    #     if register:
-    #         string = type(self).__dict__[register].__doc__
-    #         return string
-    #     else:
-    #         string = ""
-    #         for key in type(self).__dict__.keys():
-    #             if isinstance(type(self).__dict__[key], BaseAttribute):
-    #                 docstring = self.help(key)
-    #                 # mute internal registers
-    #                 if not docstring.startswith('_'):
-    #                     string += key + ": " + docstring + '\r\n\r\n'
-    #         return string
     def help(self, register=''):
-        return "Please refer to the docstring of the function setup() or " \
-               "to the manual for further help! "
+        """returns the docstring of the specified register name
+           if register is an empty string, all available docstrings are
+           returned"""
+        # the docstrings are collected by ModuleMetaClass.make_help()
+        if register:
+            try:
+                return type(self)._help_cache[register]
+            except KeyError:
+                raise ValueError("Module %s has no attribute %s."
+                                 % (self.name, register))
+        else:
+            return type(self)._help_full
 
     def _create_widget(self):
         """
@@ -651,8 +790,12 @@ class Module(with_metaclass(ModuleMetaClass, object)):
          - changes the visibility of the module_widget in the gui
          - re-setups the module with the module attributes in the config-file
            if new ownership is None
+
+        Nothing is done if the owner does not change.
         """
-        old = self.owner
+        old = self._owner
+        if old == val:
+            return
         self._owner = val
         if val is None:
             self._autosave_active = True
@@ -713,6 +856,10 @@ class HardwareModule(Module):
 
     parent = None  # parent will be redpitaya instance
 
+    # buffer {addr: value} of register writes during _batch_writes(),
+    # None if writes are sent immediately
+    _pending_writes = None
+
     def __init__(self, parent, name=None):
         """ Creates the prototype of a RedPitaya Module interface
 
@@ -748,29 +895,81 @@ class HardwareModule(Module):
             return 1.0
 
     def _reads(self, addr, length):
+        if self._pending_writes:
+            self._flush_writes()
         return self._client.reads(self._addr_base + addr, length)
 
     def _writes(self, addr, values):
+        if self._pending_writes:
+            self._flush_writes()
         self._client.writes(self._addr_base + addr, values)
 
     def _read(self, addr):
         return int(self._reads(addr, 1)[0])
 
     def _write(self, addr, value):
-        self._writes(addr, [int(value)])
+        pending = self._pending_writes
+        if pending is None:
+            self._writes(addr, [int(value)])
+        else:
+            if addr in pending:
+                # never drop a write, e.g. a reset pulse written as 1 then 0
+                self._flush_writes()
+            pending[addr] = int(value)
+
+    @contextmanager
+    def _batch_writes(self):
+        """
+        Buffers the single-register writes performed inside the context
+        and sends them when leaving it, such that writes to consecutive
+        addresses are merged into a single transaction with the redpitaya.
+
+        Any read flushes the buffer first, so reads always reflect all
+        preceding writes.
+        """
+        if self._pending_writes is not None:  # nested call, already batching
+            yield
+            return
+        self._pending_writes = {}
+        try:
+            yield
+        finally:
+            try:
+                self._flush_writes()
+            finally:
+                self._pending_writes = None
+
+    def _flush_writes(self):
+        """
+        Sends the buffered writes, sorted by address, with one call to
+        client.writes per block of contiguous addresses.
+        """
+        pending = self._pending_writes
+        if not pending:
+            return
+        items = sorted(pending.items())
+        pending.clear()
+        start, values = items[0][0], [items[0][1]]
+        for addr, value in items[1:]:
+            if addr == start + 4 * len(values):
+                values.append(value)
+            else:
+                self._client.writes(self._addr_base + start, values)
+                start, values = addr, [value]
+        self._client.writes(self._addr_base + start, values)
 
     def _to_pyint(self, v, bitlength=14):
-        v = v & (2 ** bitlength - 1)
+        # convert first such that the bit operations below act on a python
+        # int rather than on a numpy scalar
+        v = int(v) & ((1 << bitlength) - 1)
         if v >> (bitlength - 1):
-            v = v - 2 ** bitlength
-        return int(v)
+            v -= 1 << bitlength
+        return v
 
     def _from_pyint(self, v, bitlength=14):
-        v = int(v)
-        if v < 0:
-            v = v + 2 ** bitlength
-        v = (v & (2 ** bitlength - 1))
-        return np.uint32(v)
+        # masking a negative python int directly yields its two's complement.
+        # A plain int is returned, _write converts it with int() anyways.
+        return int(v) & ((1 << bitlength) - 1)
 
 
 class SignalModule(Module):
@@ -299,7 +299,7 @@ class Pyrpl(object):
         # missing entries from default
         pyrplbranch = self.c._get_or_create('pyrpl')
         for k in default_pyrpl_config:
-            if k not in pyrplbranch._keys():
+            if k not in pyrplbranch:
                 if k =='name':
                     # assign the same name as in config file by default
                     pyrplbranch[k] = self.c._filename_stripped
@@ -245,20 +245,19 @@ class OutputSignal(Signal):
 
     def _setup(self):
         # synchronize assisted_design parameters with p/i setting
-        self._setup_ongoing = True
-        if self.assisted_design:
-            self.i = self.desired_unity_gain_frequency
-            if self.analog_filter_cutoff == 0:
-                self.p = 0
+        with self.do_setup:
+            if self.assisted_design:
+                self.i = self.desired_unity_gain_frequency
+                if self.analog_filter_cutoff == 0:
+                    self.p = 0
+                else:
+                    self.p = self.i / self.analog_filter_cutoff
             else:
-                self.p = self.i / self.analog_filter_cutoff
-        else:
-            self.desired_unity_gain_frequency = self.i
-            if self.p == 0:
-                self.analog_filter_cutoff = 0
-            else:
-                self.analog_filter_cutoff = self.i / self.p
-        self._setup_ongoing = False
+                self.desired_unity_gain_frequency = self.i
+                if self.p == 0:
+                    self.analog_filter_cutoff = 0
+                else:
+                    self.analog_filter_cutoff = self.i / self.p
         # re-enable lock/sweep/unlock with new parameters
         if self.current_state == 'sweep':
             self.sweep()
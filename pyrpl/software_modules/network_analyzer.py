@@ -338,8 +338,10 @@ class NetworkAnalyzer(AcquisitionModule, SignalModule):
         call_setup=True)
 
     def __init__(self, parent, name=None):
-        self._setup_attributes.remove('running_state')
-        self._setup_attributes.append('running_state')
+        # running_state must come last, after the module attributes
+        type(self).make_setup_attributes(
+            [attr for attr in self._setup_attributes
+             if attr != 'running_state'] + ['running_state'])
         self.sleeptimes = 0.5
         self._time_last_point = None
         self._data_x = None
@@ -4,7 +4,7 @@ import numbers
 from pyrpl.modules import Module
 from pyrpl.attributes import BoolProperty, FilterProperty, SelectProperty, \
     FloatProperty
-from pyrpl.module_attributes import  ModuleProperty
+from pyrpl.module_attributes import  ModuleProperty, ModuleListProperty
 from pyrpl.test.test_base import TestPyrpl
 
 
@@ -35,6 +35,7 @@ class DummyModule(Module):
     some_options = SelectProperty(options=["foo", "bar"])
     sub1 = ModuleProperty(FirstSubModule)
     sub2 = ModuleProperty(SecondSubModule)
+    sub_list = ModuleListProperty(FirstSubModule, default=[])
 
 
 class TestAttributeClass(TestPyrpl):
@@ -55,6 +56,61 @@ class TestAttributeClass(TestPyrpl):
         assert (self.pyrpl.c.dummymodule.some_number == 3.123), \
             self.pyrpl.c.dummymodule.some_number
 
+    def test_help(self):
+        module = self.pyrpl.dummymodule
+        doc = DummyModule.some_number.__doc__
+        assert module.help('some_number') == doc
+        assert ("some_number: " + doc) in module.help()
+        assert "true_or_false: " in module.help()
+        try:
+            module.help('no_such_attribute')
+        except ValueError as e:
+            assert 'no_such_attribute' in str(e)
+        else:
+            assert False, "help() accepted an unknown attribute"
+
+    def test_config_branch_of_list_element(self):
+        sub_list = self.pyrpl.dummymodule.sub_list
+        sub_list.extend([dict(b1=False, b2=False),
+                         dict(b1=False, b2=True),
+                         dict(b1=True, b2=True)])
+        element = sub_list[2]
+        assert element.c.b1 == True  # caches the branch of element 2
+        del sub_list[0]
+        # the element is now number 1 and must use the corresponding branch
+        assert element.name == 1
+        assert element.c._branch == 1
+        element.b2 = False
+        assert sub_list.c[1].b1 == True
+        assert sub_list.c[1].b2 == False
+        assert sub_list.c[0].b2 == True
+        assert len(sub_list.c) == 2
+        while len(sub_list):
+            sub_list.pop()
+
+    def test_config_branch_after_erase(self):
+        sub1 = self.pyrpl.dummymodule.sub1
+        sub1.b2 = True
+        assert sub1.c.b2 == True  # caches the branch
+        sub1.c._erase()
+        assert 'sub1' not in self.pyrpl.c.dummymodule
+        # writing again must recreate the section in the config file
+        sub1.b2 = False
+        assert self.pyrpl.c.dummymodule.sub1.b2 == False
+        assert sub1.c._data is self.pyrpl.c.dummymodule.sub1._data
+
+    def test_nested_setup(self):
+        module = self.pyrpl.dummymodule
+        assert not module._setup_ongoing
+        with module.do_setup:
+            with module.do_setup:
+                assert module._setup_ongoing
+            # leaving the inner block must not end the outer one
+            assert module._setup_ongoing
+            module.setup()
+            assert module._setup_ongoing
+        assert not module._setup_ongoing
+
     def test_submodule(self):
         self.sub1 = self.pyrpl.dummymodule.sub1
         self.sub2 = self.pyrpl.dummymodule.sub2
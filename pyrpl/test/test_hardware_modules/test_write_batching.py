@@ -0,0 +1,72 @@
+import logging
+logger = logging.getLogger(name=__name__)
+from contextlib import contextmanager
+from pyrpl.test.test_base import TestPyrpl
+
+
+class TestWriteBatching(TestPyrpl):
+    """ tests the buffering of register writes in HardwareModule """
+    @contextmanager
+    def logged_writes(self):
+        """ records the arguments of all calls to client.writes """
+        client = self.r.client
+        client_writes = client.writes
+        calls = []
+
+        def writes(addr, values):
+            calls.append((addr, list(values)))
+            return client_writes(addr, values)
+        client.writes = writes
+        try:
+            yield calls
+        finally:
+            # remove the instance attribute that shadows the method
+            del client.writes
+
+    def test_contiguous_writes_are_merged(self):
+        with self.pyrpl.pids.pop('test_write_batching') as pid:
+            base = pid._addr_base
+            with self.logged_writes() as calls:
+                with pid._batch_writes():
+                    pid._write(0x108, 2)
+                    pid._write(0x104, 1)
+                    pid._write(0x124, 3)
+                    assert calls == [], calls
+                assert calls == [(base + 0x104, [1, 2]),
+                                 (base + 0x124, [3])], calls
+
+    def test_setup_merges_writes(self):
+        with self.pyrpl.pids.pop('test_write_batching') as pid:
+            base = pid._addr_base
+            with self.logged_writes() as calls:
+                pid.setup(p=1.0, i=10.0, setpoint=0.1)
+            # setpoint, p and i are at 0x104, 0x108 and 0x10C
+            assert calls[0][0] == base + 0x104, calls
+            assert len(calls[0][1]) == 3, calls
+            assert abs(pid.setpoint - 0.1) < 1e-3, pid.setpoint
+            assert abs(pid.p - 1.0) < 1e-3, pid.p
+
+    def test_repeated_address_is_not_dropped(self):
+        with self.pyrpl.pids.pop('test_write_batching') as pid:
+            base = pid._addr_base
+            with self.logged_writes() as calls:
+                with pid._batch_writes():
+                    pid._write(0x104, 1)
+                    pid._write(0x104, 0)
+                assert calls == [(base + 0x104, [1]),
+                                 (base + 0x104, [0])], calls
+
+    def test_read_flushes_pending_writes(self):
+        with self.pyrpl.pids.pop('test_write_batching') as pid:
+            base = pid._addr_base
+            with self.logged_writes() as calls:
+                with pid._batch_writes():
+                    pid._write(0x104, 5)
+                    assert pid._read(0x104) == 5
+                    assert calls == [(base + 0x104, [5])], calls
+                    # _writes also sends the pending writes first
+                    pid._write(0x104, 6)
+                    pid._writes(0x108, [7])
+                    assert calls[1:] == [(base + 0x104, [6]),
+                                         (base + 0x108, [7])], calls
+                assert len(calls) == 3, calls
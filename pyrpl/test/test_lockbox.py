@@ -33,6 +33,19 @@ class TestLockbox(TestPyrpl):
         assert len(self.lockbox.sequence) == old_len + 1
         assert self.lockbox.sequence.pop()['gain_factor']==2.0
 
+    def test_add_remove_output(self):
+        outputs = self.pyrpl.lockbox.outputs
+        old_keys = list(outputs.keys())
+        output_cls = type(outputs[old_keys[0]])
+        for remove in [outputs.pop, outputs.__delitem__]:
+            outputs['test_output'] = output_cls
+            assert 'test_output' in outputs.keys()
+            assert 'test_output' in outputs.setup_attributes
+            remove('test_output')
+            assert list(outputs.keys()) == old_keys
+            assert [o.name for o in outputs.values()] == old_keys
+            assert 'test_output' not in outputs.setup_attributes
+
     def test_real_lock(self):
         delay = 0.01
         pid = self.pyrpl.rp.pid1
@@ -70,6 +70,21 @@ class TestMemory(object):
             if m._filename is not None:
                 os.remove(m._filename)
 
+    def test_no_save_if_unchanged(self):
+        m = MemoryTree()
+        m.a = 1
+        m.b = [1.0, 2.0]
+        counter = m._save_counter
+        m.a = 1
+        m.b[1] = 2.0
+        assert m._save_counter == counter
+        m.a = 1.0  # same value, but different type
+        assert m._save_counter == counter + 1
+        assert isinstance(m.a, float)
+        m.b[1] = 3.0
+        assert m._save_counter == counter + 2
+        assert m.b[1] == 3.0
+
     def test_two_trees(self):
         """ makes two different memorytree objects that might have conflicts w.r.t. each other.
 
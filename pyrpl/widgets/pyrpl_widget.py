@@ -288,7 +288,7 @@ class PyrplWidget(QtWidgets.QMainWindow):
         if self.isVisible():
             #  pre-serialize binary data as "latin1" string
             act_state = (bytes(self.saveState())).decode("latin1")
-            if (not "dock_positions" in self.parent.c.pyrpl._keys()) or \
+            if (not "dock_positions" in self.parent.c.pyrpl) or \
                (self.parent.c.pyrpl["dock_positions"]!=act_state):
                 self.parent.c.pyrpl["dock_positions"] = act_state
             act_window_pos = self.window_position
@@ -299,7 +299,7 @@ class PyrplWidget(QtWidgets.QMainWindow):
         #    self.logger.debug("Gui is not started. Cannot save position.\n")
 
     def set_window_position(self):
-        if "dock_positions" in self.parent.c.pyrpl._keys():
+        if "dock_positions" in self.parent.c.pyrpl:
             try:
                 self.restoreState(
                     self.parent.c.pyrpl.dock_positions.encode("latin1"))